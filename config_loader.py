@@ -1,33 +1,76 @@
-import json
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import orjson
+from dotenv import load_dotenv
 
 BASE_DIR = Path(__file__).resolve().parent
 CONFIG_PATH = BASE_DIR / "config.json"
+MATCHES_PATH = BASE_DIR / "matches.json"
 
 
 def load_config() -> Dict[str, Any]:
     """
-    Load the configuration from config.json and merge any overrides on top of defaults.
+    Load the configuration from config.json.
     """
-    if not CONFIG_PATH.exists():
+    try:
+        raw = orjson.loads(CONFIG_PATH.read_bytes())
+    except FileNotFoundError:
         print("config.json is missing; skipping configuration load.")
         return {}
-
-    try:
-        raw = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
     except Exception as exc:
         print("Failed to parse config.json:", exc)
         return {}
+    return raw
+
+
+def _match_time(entry: Dict[str, Any]) -> str:
+    return entry.get("time") or ""
+
+
+def merge_matches(existing: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Replace entries of `existing` that share (sport, id) with `new`, keeping everything else.
+    `existing` comes from matches.json, which is always written from this output in time order,
+    so only `new` is sorted and the two runs are merged in a single linear pass.
+    Returns the merged list and how many existing entries were kept.
+    """
+    new_keys: FrozenSet[Tuple[Any, Any]] = frozenset((item["sport"], item["id"]) for item in new)
+    preserved = [item for item in existing if (item.get("sport"), item.get("id")) not in new_keys]
+    fresh = sorted(new, key=_match_time)
+    if not preserved or not fresh or _match_time(preserved[-1]) <= _match_time(fresh[0]):
+        return preserved + fresh, len(preserved)
+
+    merged: List[Optional[Dict[str, Any]]] = [None] * (len(preserved) + len(fresh))
+    i = j = 0
+    for k in range(len(merged)):
+        # Ties go to the preserved entry, matching a stable sort of preserved + new.
+        if j == len(fresh) or (i < len(preserved) and _match_time(preserved[i]) <= _match_time(fresh[j])):
+            merged[k] = preserved[i]
+            i += 1
+        else:
+            merged[k] = fresh[j]
+            j += 1
+    return merged, len(preserved)  # type: ignore[return-value]
+
+
+def load_existing_matches() -> List[Dict[str, Any]]:
+    """Load matches.json (all sports); a missing file yields an empty list."""
+    try:
+        return orjson.loads(MATCHES_PATH.read_bytes())
+    except FileNotFoundError:
+        return []
+    except orjson.JSONDecodeError as exc:
+        # A corrupted file is reported and will be overwritten by the next write.
+        print(f"Warning: {MATCHES_PATH} contained invalid JSON ({exc}), overwriting.")
+        return []
+
 
-    merged: Dict[str, Any] = {}
-    for key, default_section in raw.items():
-        section = default_section.copy()
-        incoming = raw.get(key)
-        if isinstance(incoming, dict):
-            section.update(incoming)
-        merged[key] = section
-    return merged
+def write_matches(matches: List[Dict[str, Any]]):
+    """Write the merged list back to matches.json."""
+    MATCHES_PATH.write_bytes(orjson.dumps(matches, option=orjson.OPT_INDENT_2))
 
 
+# Every module imports config_loader first, so .env (API tokens, OPENAI_API_KEY) is loaded exactly once here.
+load_dotenv()
 CONFIG = load_config()
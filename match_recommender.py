@@ -1,39 +1,76 @@
 # match_recommender.py
 # 一个最小可跑的「体育+电竞比赛推荐」脚本
 
+import argparse
+import hashlib
+import heapq
 import os
-import json
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
 from time import perf_counter
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, Callable, List, Dict, Any, Optional, Tuple
 
-from config_loader import load_config
+from config_loader import CONFIG
 
-from dotenv import load_dotenv
-from openai import OpenAI
-from football import fetch_football_matches, load_allowed_competitions, load_football_api_token, normalize_football_match
-from cs2 import fetch_cs2_matches, load_cs2_api_token, normalize_cs2_match
-from lol import fetch_lol_matches, load_lol_api_token, normalize_lol_match
+import orjson
 
-from time_utils import convert_utc_to_local_time
+from time_utils import convert_utc_to_local_time, parse_utc_time
 
+# openai（连带 httpx、pydantic）和各赛程模块导入较慢，推迟到真正用到时再导入
+if TYPE_CHECKING:
+    from openai import OpenAI
 
-client: Optional[OpenAI] = None  # 延迟创建，先检查是否有 API Key
+
+client: Optional["OpenAI"] = None  # 延迟创建，先检查是否有 API Key
 
 BASE_DIR = Path(__file__).resolve().parent
 USER_PROFILE_PATH = BASE_DIR / "user_profile.txt"
 
 
-load_dotenv()  # 读取 .env 里的 OPENAI_API_KEY
-CONFIG = load_config()
 MODEL = CONFIG["settings"].get("model", "gpt-5-nano")
 DEBUG_MODE = CONFIG["settings"].get("debug_mode", False)
+SHARD_SIZE = CONFIG["settings"].get("shard_size", 20)  # 每次请求最多打分的比赛数
+MAX_CONCURRENCY = CONFIG["settings"].get("max_concurrency", 4)  # 同时进行的 API 请求数上限
+MAX_RETRIES = CONFIG["settings"].get("max_retries", 3)  # 限流 / 5xx / 网络错误时的重试次数（指数退避）
+BATCH_POLL_INTERVAL = CONFIG["settings"].get("batch_poll_interval", 60)  # 秒
+BATCH_FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+CACHE_ENABLED = CONFIG["settings"].get("cache_enabled", True)
+CACHE_TTL = CONFIG["settings"].get("cache_ttl", 3600)  # 秒
+CACHE_DIR = Path.home() / ".cache" / "match_recommender"
+PAST_MATCH_GRACE = timedelta(hours=2)  # 开赛不到 2 小时的比赛可能还在进行，仍然保留
+
+# 结构化输出：让模型严格按此 JSON Schema 返回，不再需要在 prompt 里描述格式
+RECOMMENDATION_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "recommendations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "score": {"type": "integer", "minimum": 0, "maximum": 100},
+                    "reason": {"type": "string"},
+                },
+                "required": ["id", "score", "reason"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["recommendations"],
+    "additionalProperties": False,
+}
 
 
 # ===== 核心函数：调用 OpenAI 做推荐 =====
 
 
-def get_client() -> Optional[OpenAI]:
+def get_client() -> Optional["OpenAI"]:
     """
     运行前先检查是否设置了 OPENAI_API_KEY，避免无 Key 时再请求才报错。
     如果有 Key，则创建并返回 OpenAI 客户端实例。
@@ -46,7 +83,16 @@ def get_client() -> Optional[OpenAI]:
         return None
 
     if client is None:
-        client = OpenAI(api_key=api_key)
+        import httpx
+        from openai import DefaultHttpxClient, OpenAI
+
+        # 分片并行打分时所有请求共用一个连接池；HTTP/2 让它们复用同一条 TLS 连接多路传输
+        http_client = DefaultHttpxClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+        # 429、5xx、连接错误和超时由 SDK 按指数退避自动重试（会参考 Retry-After），全部失败才抛出
+        client = OpenAI(api_key=api_key, http_client=http_client, max_retries=MAX_RETRIES)
     return client
 
 
@@ -72,97 +118,311 @@ def load_user_profile(path: Path = USER_PROFILE_PATH) -> str:
     return profile
 
 
-def build_prompt(user_profile: str, matches: List[Dict[str, Any]]) -> str:
+def compact_match(match: Dict[str, Any]) -> Dict[str, Any]:
     """
-    把用户兴趣 + 比赛列表拼成一个 prompt 给模型看
+    只保留模型打分需要的字段（去掉 raw、venue、source、status 等），缩小 prompt 体积；
+    空字段直接省略，不给模型发 null
     """
-    return f"""
+    fields = {
+        "teams": match.get("teams"),
+        "time": match.get("time"),
+        "sport": match.get("sport"),
+        "league": match.get("league") or match.get("tournament"),  # 电竞比赛用赛事名代替联赛
+        "importance": match.get("importance"),
+    }
+    compact = {"id": match["id"]}
+    compact.update((key, value) for key, value in fields.items() if value)
+    return compact
+
+
+# prompt 的固定片段放在模块级，拼接时只需一次 join
+_SYSTEM_PROMPT_HEAD = """
 你是一个资深体育+电竞赛事推荐编辑，需要根据用户兴趣对比赛进行打分排序并给出推荐理由。
 
 【用户兴趣】
-{user_profile}
-
-【待选比赛列表（JSON 数组）】
-{json.dumps(matches, ensure_ascii=False)}
-
-请根据用户兴趣为每场比赛打分并排序，要求：
-1. 返回一个 JSON 对象，字段为 "recommendations"（数组）。
-2. recommendations 数组中每个元素包含字段：
-   - id: 比赛 id（整数）
-   - teams：比赛双方的队名，格式如 "队伍A vs 队伍B"，不要包括别的信息。如果不是电竞比赛，则把队名全部翻译成中文。如果是电竞比赛，则把队名的缩写扩展成队伍全名。
-   - score: 推荐分数（0-100 的整数，越高越推荐）
-   - reason: 推荐理由（简短说明为什么推荐这场比赛，围绕用户兴趣展开）
-3. 只输出 JSON，不要任何额外解释、文字或代码块标记。
 """
+_SYSTEM_PROMPT_TAIL = """
 
+用户消息会给出待选比赛列表（JSON 数组）。请根据用户兴趣为每场比赛打分：
+- score：0-100 的整数，越高越推荐
+- reason：简短说明为什么推荐这场比赛，围绕用户兴趣展开
+"""
+_PROMPT_HEAD = "\n【待选比赛列表（JSON 数组）】\n"
+_PROMPT_TAIL = "\n"
 
-def call_model_for_recommendations(user_profile: str,
-                                   matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+
+def build_system_prompt(user_profile: str) -> str:
     """
-    调用 OpenAI Responses API，请模型给出推荐结果（结构化 JSON）
+    把角色说明 + 用户兴趣 + 输出要求拼成固定前缀放进 system 消息。
+    同一份用户兴趣下，各分片、各次运行的前缀逐字节相同，可以命中 OpenAI 的前缀缓存（缓存部分半价且更快）。
     """
-    if not matches:
-        print("没有待选比赛。")
-        return []
+    return "".join((_SYSTEM_PROMPT_HEAD, user_profile, _SYSTEM_PROMPT_TAIL))
+
+
+def build_prompt(matches: List[Dict[str, Any]]) -> str:
+    """
+    只把每次都会变化的比赛列表放进 user 消息，排在固定前缀之后
+    """
+    compact = [compact_match(m) for m in matches]
+    return "".join((_PROMPT_HEAD, orjson.dumps(compact).decode(), _PROMPT_TAIL))
 
-    api_client = get_client()
-    if api_client is None:  # 没有生成客户端实体
-        return []
 
-    prompt = build_prompt(user_profile, matches)
+def recommendation_cache_key(payloads: List[Dict[str, Any]]) -> str:
+    """
+    对各分片实际发送的请求体（模型、system prompt、输出 schema、精简后的比赛列表）计算 SHA-256，作为推荐缓存的文件名。
+    改了 prompt、schema 或分片大小都会换 key；模型看不到的字段变化则不影响命中
+    """
+    return hashlib.sha256(orjson.dumps(payloads, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def load_cached_recommendations(key: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    读取未过期的推荐缓存，不存在、过期或损坏时返回 None
+    """
+    path = CACHE_DIR / f"{key}.json"
+    try:
+        if time.time() - path.stat().st_mtime > CACHE_TTL:
+            return None
+        recs = orjson.loads(path.read_bytes())["recommendations"]
+    except (OSError, orjson.JSONDecodeError, KeyError, TypeError):
+        return None
+    return recs if isinstance(recs, list) else None
+
 
+def save_cached_recommendations(key: str, recommendations: List[Dict[str, Any]]) -> None:
+    """
+    先写临时文件再原子替换，避免并发运行读到写了一半的缓存
+    """
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(orjson.dumps({"recommendations": recommendations}))
+        os.replace(tmp_path, CACHE_DIR / f"{key}.json")
+    except OSError as e:
+        print("写入推荐缓存失败：", repr(e))
+
+
+def build_request(user_profile: str, matches: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    组装一次 Responses API 请求的参数；实时调用与 Batch 任务共用同一份请求体
+    """
+    return {
+        "model": MODEL,
+        "input": [
+            {
+                "role": "system",
+                "content": build_system_prompt(user_profile)
+            },
+            {
+                "role": "user",
+                "content": build_prompt(matches)
+            }
+        ],
+        # strict json_schema 保证 output_text 就是符合 RECOMMENDATION_SCHEMA 的 JSON，不会再带代码块标记
+        "text": {
+            "format": {
+                "type": "json_schema",
+                "name": "recs",
+                "schema": RECOMMENDATION_SCHEMA,
+                "strict": True,
+            }
+        },
+    }
+
+
+def parse_recommendations(raw_text: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    解析模型输出的 JSON 文本，取出 recommendations 数组；格式不对时返回 None
+    """
+    try:
+        data = orjson.loads(raw_text)
+    except orjson.JSONDecodeError:
+        print("解析 JSON 失败，模型原始输出如下：")
+        print(raw_text)
+        return None
+
+    recs = data.get("recommendations", [])
+    if not isinstance(recs, list):
+        print("返回的 JSON 中没有有效的 recommendations 数组。原始数据：", data)
+        return None
+
+    return recs
+
+
+def request_recommendations(api_client: "OpenAI", payload: Dict[str, Any],
+                            n_matches: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    用 build_request 组好的请求体对一批比赛（n_matches 场）调用一次 OpenAI Responses API，
+    解析出 recommendations 数组；失败时返回 None
+    """
     start = perf_counter()
     try:
-        response = api_client.responses.create(
-            model=MODEL,
-            input=[
-                {
-                    "role": "system",
-                    "content": "你是一个专业的体育+电竞赛事推荐助手，会输出严格的 JSON。"
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            # 默认 text 输出即可，通过 SDK 的 output_text 取完整文本
-        )
+        response = api_client.responses.create(**payload)
     except Exception as e:
         print("调用 OpenAI API 出错：", repr(e))
-        return []
+        return None
 
     if DEBUG_MODE:
         elapsed = perf_counter() - start
-        print(f"[debug] OpenAI API call took {elapsed:.2f}s")
+        print(f"[debug] OpenAI API call ({n_matches} matches) took {elapsed:.2f}s")
 
     # SDK 会帮你把所有 text 输出拼在一起放到 output_text 里
     raw_text = getattr(response, "output_text", None)
     if not raw_text:
         print("模型没有返回文本输出，原始响应：", response)
-        return []
+        return None
+
+    return parse_recommendations(raw_text)
 
-    # 尝试解析 JSON
+
+def submit_batch(api_client: "OpenAI", payloads: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    把每个分片的请求体写成一行 /v1/responses 请求（JSONL）上传，并创建 24 小时窗口的 Batch 任务，返回 batch id
+    """
+    jsonl = b"".join(
+        orjson.dumps({
+            "custom_id": f"shard-{i}",
+            "method": "POST",
+            "url": "/v1/responses",
+            "body": payload,
+        }) + b"\n"
+        for i, payload in enumerate(payloads)
+    )
     try:
-        data = json.loads(raw_text)
-    except json.JSONDecodeError:
-        print("解析 JSON 失败，模型原始输出如下：")
-        print(raw_text)
+        input_file = api_client.files.create(file=("recommendations.jsonl", jsonl), purpose="batch")
+        batch = api_client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/responses",
+            completion_window="24h",
+        )
+    except Exception as e:
+        print("提交 OpenAI Batch 任务出错：", repr(e))
+        return None
+
+    print(f"已提交 Batch 任务 {batch.id}，等待结果...")
+    return batch.id
+
+
+def extract_output_text(body: Dict[str, Any]) -> str:
+    """
+    从 Batch 输出里的原始 Responses 对象拼出全部文本（等价于 SDK 的 output_text）
+    """
+    return "".join(
+        part.get("text", "")
+        for item in body.get("output") or []
+        if item.get("type") == "message"
+        for part in item.get("content") or []
+        if part.get("type") == "output_text"
+    )
+
+
+def poll_batch(api_client: "OpenAI", batch_id: str, shard_count: int) -> List[Optional[List[Dict[str, Any]]]]:
+    """
+    轮询 Batch 任务直到结束，按分片顺序返回每片的 recommendations（失败的分片为 None）
+    """
+    try:
+        batch = api_client.batches.retrieve(batch_id)
+        while batch.status not in BATCH_FINAL_STATUSES:
+            if DEBUG_MODE:
+                print(f"[debug] Batch {batch_id} status: {batch.status}")
+            time.sleep(BATCH_POLL_INTERVAL)
+            batch = api_client.batches.retrieve(batch_id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            print(f"Batch 任务 {batch_id} 未成功完成，状态：{batch.status}")
+            return [None] * shard_count
+        output = api_client.files.content(batch.output_file_id).content
+    except Exception as e:
+        print("查询 OpenAI Batch 任务出错：", repr(e))
+        return [None] * shard_count
+
+    results: Dict[str, Optional[List[Dict[str, Any]]]] = {}
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            # 无法解析的行对应不到分片，该分片按失败（None）处理
+            print("Batch 输出中有一行无法解析：", repr(e))
+            continue
+        custom_id = record.get("custom_id")
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            print(f"Batch 请求 {custom_id} 失败：", record.get("error") or response.get("body"))
+            continue
+
+        raw_text = extract_output_text(response.get("body") or {})
+        if not raw_text:
+            print(f"Batch 请求 {custom_id} 没有返回文本输出。")
+            continue
+        results[custom_id] = parse_recommendations(raw_text)
+
+    return [results.get(f"shard-{i}") for i in range(shard_count)]
+
+
+def call_model_for_recommendations(user_profile: str,
+                                   matches: List[Dict[str, Any]],
+                                   use_batch: bool = False) -> List[Dict[str, Any]]:
+    """
+    调用 OpenAI Responses API，请模型给出推荐结果（结构化 JSON）。
+    比赛较多时按 SHARD_SIZE 分片并行打分；分数是 0-100 的绝对值，各片结果可直接合并。
+    use_batch 为 True 时改走 Batch API（半价，24 小时内完成），适合定时任务。
+    """
+    if not matches:
+        print("没有待选比赛。")
         return []
 
-    recs = data.get("recommendations", [])
-    if not isinstance(recs, list):
-        print("返回的 JSON 中没有有效的 recommendations 数组。原始数据：", data)
+    shards = [matches[i:i + SHARD_SIZE] for i in range(0, len(matches), SHARD_SIZE)]
+    # 每个分片的请求体只组装一次，缓存 key 和实际调用共用
+    payloads = [build_request(user_profile, shard) for shard in shards]
+
+    # 发送的请求与上次完全相同时直接复用上次的结果，省掉 API 调用
+    cache_key = recommendation_cache_key(payloads) if CACHE_ENABLED else None
+    if cache_key:
+        cached = load_cached_recommendations(cache_key)
+        if cached is not None:
+            if DEBUG_MODE:
+                print("[debug] 命中推荐缓存，跳过 OpenAI API 调用")
+            return cached
+
+    api_client = get_client()
+    if api_client is None:  # 没有生成客户端实体
         return []
 
+    if use_batch:
+        batch_id = submit_batch(api_client, payloads)
+        shard_results = poll_batch(api_client, batch_id, len(shards)) if batch_id else [None]
+    else:
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+            shard_results = list(executor.map(
+                lambda payload, shard: request_recommendations(api_client, payload, len(shard)), payloads, shards
+            ))
+
+    recs: List[Dict[str, Any]] = []
+    complete = True
+    for shard_recs in shard_results:
+        if shard_recs is None:
+            complete = False
+            continue
+        recs.extend(shard_recs)
+
+    # 只缓存所有分片都成功的结果，避免把残缺列表当成命中
+    if cache_key and recs and complete:
+        save_cached_recommendations(cache_key, recs)
     return recs
 
 
-def find_match_by_id(match_id: int, matches: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """辅助函数：通过 id 找到对应比赛信息"""
-    for m in matches:
-        if m.get("id") == match_id:
-            return m
-    return {}
+# 每条推荐的固定输出格式，打印时整块 write 一次
+_RECOMMENDATION_TEMPLATE = (
+    "{idx}. [ {score} 分] {teams}\n"
+    "   时间: {local_time}（{sport} | 本机时区）\n"
+    "   联赛/项目: {league}\n"
+    "   重要性: {importance}\n"
+    "   推荐理由: {reason}\n"
+    "\n"
+)
 
 
 def print_recommendations(recommendations: List[Dict[str, Any]], matches: List[Dict[str, Any]],
@@ -173,11 +433,14 @@ def print_recommendations(recommendations: List[Dict[str, Any]], matches: List[D
     :param matches: 标准化后的赛事数据列表
     :param count: 展示的推荐数量，默认前10
     """
-    # 1. 按推荐分数降序排序，限制展示数量
-    sorted_recs = sorted(recommendations, key=lambda x: x["score"], reverse=True)[:count]
+    # 1. 按推荐分数取前 count 条（堆选择，无需对整个列表排序）
+    sorted_recs = heapq.nlargest(count, recommendations, key=itemgetter("score"))
     if DEBUG_MODE:
         print(f"已推荐{len(sorted_recs)}场比赛。")
 
+    # 预先按 id 建索引，避免每条推荐都线性扫描 matches（倒序构建，id 重复时保留第一条）
+    by_id = {m.get("id"): m for m in reversed(matches)}
+
     # 2. 打印标题
     print("\n=== 个性化赛事推荐===")
 
@@ -185,84 +448,139 @@ def print_recommendations(recommendations: List[Dict[str, Any]], matches: List[D
     for idx, rec in enumerate(sorted_recs, 1):
         # 3.1 根据赛事ID匹配原始赛事数据（处理无匹配的异常）
 
-        try:
-            match = next(m for m in matches if m["id"] == rec["id"])
-        except StopIteration:
+        match = by_id.get(rec["id"])
+        if match is None:
             print(f"{idx}. 推荐分数：{rec['score']}分 | 赛事数据不存在（ID：{rec['id']}）")
             continue
 
-        # 3.2 将UTC时间转为本机时区时间
-        original_utc_time = match.get("time", "未知时间")  # 防KeyError
-        local_time = convert_utc_to_local_time(original_utc_time)
+        # 3.2 一次性格式化整条推荐（UTC 时间转本机时区；联赛缺失时用项目填充）并整块写出
+        sport = match.get("sport", "未知项目")
+        sys.stdout.write(_RECOMMENDATION_TEMPLATE.format(
+            idx=idx,
+            score=rec["score"],
+            teams=match.get("teams", "未知对阵"),
+            local_time=convert_utc_to_local_time(match.get("time", "未知时间")),
+            sport=sport,
+            league=match.get("league", sport),
+            importance=match.get("importance", "未知重要性"),
+            reason=rec.get("reason", "无推荐理由"),
+        ))
+
+
+def load_football_matches(token: str) -> List[Dict[str, Any]]:
+    """拉取足球赛程，按 database.json 的联赛白名单过滤后标准化。"""
+    from football import fetch_football_matches, load_allowed_competitions, normalize_football_match
+
+    raw_football_matches = fetch_football_matches(token)
+    allowed_competitions = load_allowed_competitions()
+    if allowed_competitions:
+        raw_football_matches = [
+            match
+            for match in raw_football_matches
+            if (match.get("competition") or {}).get("name") in allowed_competitions
+        ]
+    return [normalize_football_match(m) for m in raw_football_matches]
+
+
+def load_pandascore_matches(sport: str, token: str) -> List[Dict[str, Any]]:
+    """拉取指定电竞项目（cs2 / lol）的 PandaScore 赛程并标准化。"""
+    from pandascore import fetch_matches, normalize_match
 
-        # 3.3 格式化打印
-        score = rec["score"]  # 推荐分数
-        teams_str = match.get("teams", "未知对阵")  # 完整对阵字符串（含阶段）
-        local_time = convert_utc_to_local_time(match.get("time", "未知时间"))  # 转换后的时间
-        sport = match.get("sport", "未知项目")  # 项目/运动类型
-        league = match.get("league", sport)  # 联赛（无则用项目填充）
-        importance = match.get("importance", "未知重要性")  # 重要性
-        reason = rec.get("reason", "无推荐理由")  # 推荐理由
+    return [normalize_match(sport, m) for m in fetch_matches(sport, token)]
 
-        # 2. 按指定格式拼接输出（严格匹配示例）
-        print(f"{idx}. [ {score} 分] {teams_str}")
-        print(f"   时间: {local_time}（{sport} | 本机时区）")
-        print(f"   联赛/项目: {league}")
-        print(f"   重要性: {importance}")
-        print(f"   推荐理由: {reason}")
-        print()
+
+def load_all_matches() -> List[Dict[str, Any]]:
+    """
+    读取各数据源的 token 并拉取全部赛程；各项目的请求互不依赖，放到线程池里并行
+    """
+    from football import load_football_api_token
+    from pandascore import load_pandascore_api_token
+
+    tasks: List[Tuple[str, Callable[[], List[Dict[str, Any]]]]] = []
+
+    football_token = load_football_api_token()
+    if football_token:
+        tasks.append(("足球", lambda: load_football_matches(football_token)))
+
+    # CS2 与 LoL 共用同一个 PandaScore token
+    pandascore_token = load_pandascore_api_token()
+    if pandascore_token:
+        tasks.append(("CS2", lambda: load_pandascore_matches("cs2", pandascore_token)))
+        tasks.append(("LoL", lambda: load_pandascore_matches("lol", pandascore_token)))
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {executor.submit(task): label for label, task in tasks}
+        for future in as_completed(futures):
+            label = futures[future]
+            try:
+                results[label] = future.result()
+                print(f"已从 API 获取 {len(results[label])} 场{label}比赛。")
+            except Exception as exc:
+                print(f"获取{label}比赛列表失败：", repr(exc))
+
+    # 按固定顺序拼接，避免结果受线程完成先后影响
+    return [match for label, _ in tasks for match in results.get(label, [])]
+
+
+def upcoming_matches(matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    丢弃开赛已超过 PAST_MATCH_GRACE 的比赛，其余按开赛时间升序排列；
+    时间缺失或无法解析的比赛不过滤，排在最后
+    """
+    cutoff = datetime.now(timezone.utc) - PAST_MATCH_GRACE
+    timed: List[Tuple[datetime, Dict[str, Any]]] = []
+    untimed: List[Dict[str, Any]] = []
+    for match in matches:
+        start = parse_utc_time(match.get("time"))
+        if start is None:
+            untimed.append(match)
+        elif start >= cutoff:
+            timed.append((start, match))
+
+    timed.sort(key=itemgetter(0))
+    return [match for _, match in timed] + untimed
+
+
+def dedupe_matches(matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    按 (项目, 对阵, 开赛时间) 去重，保留第一次出现的比赛；
+    去重后重新分配从 1 开始的连续 id，保证发给模型的 id 唯一且都是整数
+    """
+    seen = set()
+    unique: List[Dict[str, Any]] = []
+    for match in matches:
+        key = (match.get("sport"), match.get("teams"), match.get("time"))
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(match)
+
+    for new_id, match in enumerate(unique, 1):
+        match["id"] = new_id
+    return unique
 
 
 def main():
+    parser = argparse.ArgumentParser(description="体育+电竞比赛推荐")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="通过 OpenAI Batch API 提交打分任务（费用减半，24 小时内完成），适合定时运行",
+    )
+    args = parser.parse_args()
+
     print("正在生成今日比赛推荐...\n")
 
     user_profile = load_user_profile()
 
     # 启动时先拉取 API，再生成推荐
-    matches: List[Dict[str, Any]] = []
-
-    football_token = load_football_api_token()
-    football_matches = []
-    if football_token:
-        try:
-            raw_football_matches = fetch_football_matches(football_token)
-            allowed_competitions = load_allowed_competitions()
-            if allowed_competitions:
-                raw_football_matches = [
-                    match
-                    for match in raw_football_matches
-                    if (match.get("competition") or {}).get("name") in allowed_competitions
-                ]
-            football_matches = [normalize_football_match(m) for m in raw_football_matches]
-            print(f"已从 API 获取 {len(football_matches)} 场足球比赛。")
-        except Exception as exc:
-            print("获取比赛列表失败：", repr(exc))
-
-    cs2_token = load_cs2_api_token()
-    cs2_matches = []
-    if cs2_token:
-        try:
-            raw_cs2_matches = fetch_cs2_matches(cs2_token)
-            cs2_matches = [normalize_cs2_match(m) for m in raw_cs2_matches]
-            print(f"已从 API 获取 {len(cs2_matches)} 场 CS2 比赛。")
-        except Exception as exc:
-            print("获取比赛列表失败：", repr(exc))
-
-    lol_token = load_lol_api_token()
-    lol_matches = []
-    if lol_token:
-        try:
-            raw_lol_matches = fetch_lol_matches(lol_token)
-            lol_matches = [normalize_lol_match(m) for m in raw_lol_matches]
-            print(f"已从 API 获取 {len(lol_matches)} 场 LoL 比赛。")
-        except Exception as exc:
-            print("获取比赛列表失败：", repr(exc))
-    
-    matches = football_matches + cs2_matches + lol_matches
+    matches = dedupe_matches(upcoming_matches(load_all_matches()))
 
     recommendations = call_model_for_recommendations(
         user_profile=user_profile,
-        matches=matches
+        matches=matches,
+        use_batch=args.batch
     )
 
     print_recommendations(recommendations, matches)
@@ -0,0 +1,138 @@
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Final, List, Optional
+
+import orjson
+import requests
+from config_loader import CONFIG, MATCHES_PATH, load_existing_matches, merge_matches, write_matches
+from http_session import make_session
+from time_utils import normalize_time
+
+# Sports served by PandaScore; each key doubles as the config.json section and the "sport" field.
+SPORT_LABELS = {"cs2": "CS2", "lol": "LoL"}
+SOURCE: Final = "pandascore.co"
+# importance only depends on the configured tier, so build each sport's label once.
+_IMPORTANCE: Final = {
+    sport: "tier-" + CONFIG[sport]["tier"][-1] if CONFIG[sport]["tier"] else "unknown"
+    for sport in SPORT_LABELS
+}
+
+# Shared session: keep-alive connection pool plus retries on transient errors.
+_SESSION = make_session()
+
+
+def load_pandascore_api_token() -> Optional[str]:
+    """Load the PandaScore API token (shared by every esport) from environment variables."""
+    token = os.getenv("PANDASCORE_API_TOKEN")
+    if not token:
+        print("Please provide PANDASCORE_API_TOKEN=… in your .env so we can call the PandaScore API.")
+    return token
+
+
+def build_api_url(sport: str, verbose: bool = False) -> str:
+    """Build the PandaScore tournaments URL for `sport` with required query params."""
+    section = CONFIG[sport]
+    url = section["api_url"] + "/{}?range[tier]={}".format(section["status"], ",".join(section["tier"]))
+    if verbose:
+        print(f"{SPORT_LABELS[sport]} API URL:", url)
+    return url
+
+
+def fetch_matches(sport: str, token: str, filter_past: bool = True) -> List[Dict[str, Any]]:
+    """Fetch matches of the running `sport` tournaments, skipping TBD (and, by default, past) matches."""
+    params = {"token": token}
+    url = build_api_url(sport)
+    response = _SESSION.get(url, params=params, timeout=15)
+    response.raise_for_status()
+    match_list: List[Dict[str, Any]] = []
+    # PandaScore emits UTC timestamps as "YYYY-MM-DDTHH:MM:SSZ", which sort lexicographically,
+    # so past matches can be dropped with a plain string compare instead of parsing each one.
+    now_iso = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    for tournament in orjson.loads(response.content):
+        league = tournament.get("league", {}).get("name")
+        serie = tournament.get("serie", {}).get("name")
+        tournament_name = f"{league or ''} {serie or ''}".strip() or f"{SPORT_LABELS[sport]} Tournament"
+        for match in tournament.get("matches", []):
+            match_name = match.get("name")
+            if match_name and "TBD" in match_name:
+                continue
+
+            start = match.get("begin_at") or match.get("scheduled_at")
+            if filter_past and start and start < now_iso:
+                continue
+
+            match["tournament"] = tournament_name
+            match_list.append(match)
+    return match_list
+
+
+def get_team_names(raw: Dict[str, Any]) -> List[str]:
+    """Extract readable team names from the PandaScore opponents payload."""
+    opponents = raw.get("opponents") or []
+    names: List[str] = []
+    for opponent_record in opponents:
+        opponent = opponent_record.get("opponent")
+        if not opponent:
+            continue
+        name = opponent.get("name")
+        if name:
+            names.append(name)
+    return names
+
+
+def normalize_match(sport: str, raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a single PandaScore match into the shared match schema."""
+    match_id = raw.get("id") or f"{raw.get('name', sport)}-{raw.get('begin_at')}"
+
+    team_names = get_team_names(raw)
+    teams = " vs ".join(team_names) or raw.get("name") or f"{SPORT_LABELS[sport]} Match"
+
+    tournament = raw.get("tournament") or "Unknown Tournament"
+
+    start_time = raw.get("begin_at") or raw.get("scheduled_at")
+    stage = raw.get("round") or raw.get("phase")
+
+    return {
+        "id": match_id,
+        "sport": sport,
+        "source": SOURCE,
+        "tournament": tournament,
+        "teams": teams,
+        "time": normalize_time(start_time),
+        "importance": _IMPORTANCE[sport],
+        "status": raw.get("status"),
+        "stage": stage,
+    }
+
+
+def normalize_matches(sport: str, raw_matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Normalize a list of PandaScore matches into the unified match schema.
+    Empty entries are skipped.
+    """
+    normalized: List[Dict[str, Any]] = []
+    for match in raw_matches:
+        if not match:
+            continue
+        normalized.append(normalize_match(sport, match))
+    return normalized
+
+
+def run(sport: str):
+    """Fetch `sport` matches and merge them into matches.json, keeping entries of other sports."""
+    label = SPORT_LABELS[sport]
+    token = load_pandascore_api_token()
+    if not token:
+        return
+
+    try:
+        raw_matches = fetch_matches(sport, token)
+    except requests.HTTPError as exc:
+        print(f"Failed to fetch {label} matches:", exc)
+        return
+
+    normalized = [normalize_match(sport, match) for match in raw_matches]
+    all_matches = load_existing_matches()
+    merged, preserved_count = merge_matches(all_matches, normalized)
+    write_matches(merged)
+    print(f"Stored {len(normalized)} {label} matches plus {preserved_count} existing entries into {MATCHES_PATH.name}.")
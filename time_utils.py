@@ -1,25 +1,70 @@
-import pytz
-from datetime import datetime
-from tzlocal import get_localzone
-from pytz import UnknownTimeZoneError
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+# 本机时区在第一次换算时才检测（tzlocal 也到那时才导入），之后一直复用
+_LOCAL_TIMEZONE: Optional[ZoneInfo] = None
+
 
-# 提前检测1次本机时区（避免重复检测）
 def _get_system_timezone_once() -> str:
     """仅初始化1次本机时区，缓存结果"""
+    from tzlocal import get_localzone_name
+
     try:
-        local_tz = get_localzone()
-        tz_str = str(local_tz)
-        pytz.timezone(tz_str)  # 校验有效性
+        tz_str = get_localzone_name()
+        ZoneInfo(tz_str)  # 校验有效性
 
         return tz_str
     except Exception as e:
         print(f"时区检测失败：{e}，默认UTC")
         return "UTC"
 
-# 缓存时区结果（全局变量，仅加载1次）
-LOCAL_TIMEZONE_STR = _get_system_timezone_once()
-LOCAL_TIMEZONE = pytz.timezone(LOCAL_TIMEZONE_STR)
 
+def get_local_timezone() -> ZoneInfo:
+    """首次调用时检测并缓存本机时区"""
+    global _LOCAL_TIMEZONE
+    if _LOCAL_TIMEZONE is None:
+        _LOCAL_TIMEZONE = ZoneInfo(_get_system_timezone_once())
+    return _LOCAL_TIMEZONE
+
+
+@lru_cache(maxsize=4096)
+def normalize_time(value: Optional[str]) -> str:
+    """
+    统一把 API 抓取的 UTC 时间字符串转成 ISO 8601 表示（+00:00 结尾）。
+    同一开赛时间会在多场比赛间重复出现，因此按输入缓存结果。
+    """
+    if not value:
+        return ""
+    # 快速路径：已是规范的秒级 UTC 时间（...SSZ 或 ...SS+00:00），直接改写后缀，无需 datetime 往返
+    if len(value) == 20 and value[10] == "T" and value[-1] == "Z":
+        return value[:-1] + "+00:00"
+    if len(value) == 25 and value[10] == "T" and value.endswith("+00:00"):
+        return value
+    try:
+        # 把末尾 Z 替换为 +00:00 再交给 fromisoformat 解析
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).isoformat()
+    except ValueError:
+        return value
+
+
+@lru_cache(maxsize=2048)
+def parse_utc_time(value: Optional[str]) -> Optional[datetime]:
+    """
+    把 ISO 8601 时间字符串解析为带时区的 datetime（无时区信息时按 UTC 处理），解析失败返回 None。
+    排序、过滤时同一时间会被反复解析，因此按输入缓存结果。
+    """
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=1024)
 def convert_utc_to_local_time(
     utc_time_str: str,
     output_format: str = "%Y-%m-%d %H:%M"
@@ -27,29 +72,18 @@ def convert_utc_to_local_time(
     """
     转换UTC时间到本机时区（兼容：带时区的datetime + 朴素datetime）
     解决「Not naive datetime」错误
+    本机时区检测一次后即固定，结果只取决于参数，因此按 (时间字符串, 格式) 缓存
     """
     try:
-        # 步骤1：解析时间字符串（兼容Z和+00:00格式）
-        if utc_time_str.endswith("Z"):
-            # 处理 Z 结尾的格式（如 2025-12-13T16:09:22Z）
-            utc_dt = datetime.fromisoformat(utc_time_str.replace("Z", "+00:00"))
-        else:
-            # 处理带偏移的格式（如 2025-12-13T16:09:22+00:00）
-            utc_dt = datetime.fromisoformat(utc_time_str)
-
-        # 步骤2：判断是否已有时区信息，避免重复绑定
-        if utc_dt.tzinfo is None:
-            # 无时区：手动绑定UTC
-            utc_dt = pytz.UTC.localize(utc_dt)
-        else:
-            # 已有时区：转换为UTC（兼容非UTC的情况，如+08:00）
-            utc_dt = utc_dt.astimezone(pytz.UTC)
+        # 步骤1：解析时间字符串（Z 统一替换为 +00:00，兼容两种写法）
+        utc_dt = datetime.fromisoformat(utc_time_str.replace("Z", "+00:00"))
 
-        # 步骤3：转换为本机时区（自动适配夏令时）
-        local_dt = utc_dt.astimezone(LOCAL_TIMEZONE)
+        # 步骤2：无时区信息时按 UTC 处理；已有时区（如 +08:00）交给 astimezone 直接换算
+        if utc_dt.tzinfo is None:
+            utc_dt = utc_dt.replace(tzinfo=timezone.utc)
 
-        # 步骤4：格式化输出
-        return local_dt.strftime(output_format)
+        # 步骤3：转换为本机时区（zoneinfo 自动适配夏令时）并格式化输出
+        return utc_dt.astimezone(get_local_timezone()).strftime(output_format)
 
     except Exception as e:
         print(f"时间转换失败：{e}，使用原始UTC时间")
@@ -58,9 +92,8 @@ def convert_utc_to_local_time(
 # 兼容时间戳的版本（可选）
 def convert_timestamp_to_local_time(timestamp: int, output_format: str = "%Y-%m-%d %H:%M (%Z%z)") -> str:
     try:
-        utc_dt = pytz.UTC.localize(datetime.utcfromtimestamp(timestamp))
-        local_dt = utc_dt.astimezone(LOCAL_TIMEZONE)
-        return local_dt.strftime(output_format)
+        utc_dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+        return utc_dt.astimezone(get_local_timezone()).strftime(output_format)
     except Exception as e:
         print(f"时间戳转换失败：{e}，使用原始时间戳")
         return str(timestamp)
\ No newline at end of file